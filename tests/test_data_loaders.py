@@ -0,0 +1,31 @@
+import os
+
+from uclasm import load_edgelist
+
+EDGELIST_PATH = os.path.join(os.path.dirname(__file__), os.pardir, "examples",
+                             "example_data_files", "example_edgelist.csv")
+
+
+def test_load_edgelist():
+    nodelist, channels, adjs = load_edgelist(
+        EDGELIST_PATH, src_col=0, dst_col=1, channel_col=2, header=0)
+
+    nodes = list(nodelist.node)
+    assert sorted(nodes) == list("abcdefgh")
+    assert sorted(channels) == [0, 1]
+
+    ch_to_adj = dict(zip(channels, adjs))
+    for adj in adjs:
+        assert adj.shape == (8, 8)
+
+    # Every channel 0 edge appears twice in the file, channel 1 edges once
+    assert ch_to_adj[0].nnz == 4
+    assert ch_to_adj[0].sum() == 8
+    assert ch_to_adj[1].nnz == 8
+    assert ch_to_adj[1].sum() == 8
+
+    idx = {node: i for i, node in enumerate(nodes)}
+    assert ch_to_adj[0][idx["a"], idx["b"]] == 2
+    assert ch_to_adj[0][idx["b"], idx["a"]] == 0
+    assert ch_to_adj[1][idx["h"], idx["a"]] == 1
+    assert ch_to_adj[1][idx["a"], idx["h"]] == 1
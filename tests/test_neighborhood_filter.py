@@ -0,0 +1,25 @@
+import numpy as np
+from scipy.sparse import csr_matrix
+
+from uclasm import Graph
+from uclasm.filters import neighborhood_filter
+
+
+def test_more_template_nodes_than_feasible_world_nodes():
+    # Template: node 1 has edges to both node 0 and node 2
+    tmplt_adj = csr_matrix(np.array([[0, 0, 0],
+                                     [1, 0, 1],
+                                     [0, 0, 0]]))
+    tmplt = Graph([0, 1, 2], [0], [tmplt_adj])
+
+    # World: node 0 has an edge to node 1
+    world_adj = csr_matrix(np.array([[0, 1],
+                                     [0, 0]]))
+    world = Graph([0, 1], [0], [world_adj])
+
+    candidates = np.ones((tmplt.n_nodes, world.n_nodes), dtype=bool)
+
+    # There are only 2 world nodes to assign the 3 template nodes to, so world
+    # node 0 cannot be a candidate for template node 1.
+    _, _, candidates = neighborhood_filter(tmplt, world, candidates)
+    assert not candidates[1, 0]
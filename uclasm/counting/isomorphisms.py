@@ -35,7 +35,8 @@ def recursive_isomorphism_counter(tmplt, world, candidates, *,
 
     for i, cand_idx in enumerate(cand_idxs):
         candidates_copy = candidates.copy()
-        candidates_copy[node_idx] = one_hot(cand_idx, world.n_nodes)
+        candidates_copy[node_idx] = False
+        candidates_copy[node_idx, cand_idx] = True
 
         # recurse to make assignment for the next node in the unspecified cover
         n_isomorphisms += recursive_isomorphism_counter(
@@ -68,9 +69,8 @@ def count_isomorphisms(tmplt, world, *, candidates=None, verbose=True, count_ite
 
     unspec_nodes = np.where(candidates.sum(axis=1) > 1)[0]
     tmplt_subgraph = tmplt.subgraph(unspec_nodes)
-    unspec_cover = get_node_cover(tmplt_subgraph)
-    unspec_cover_nodes = [tmplt_subgraph.nodes[node_idx] for node_idx in unspec_cover]
-    unspec_cover_idxes = [tmplt.node_idxs[node] for node in unspec_cover_nodes]
+    # Map the cover from subgraph indices back to template indices
+    unspec_cover_idxes = unspec_nodes[get_node_cover(tmplt_subgraph)]
 
     # Send zeros to init_changed_cands since we already just ran the filters
     count = recursive_isomorphism_counter(
@@ -103,7 +103,8 @@ def recursive_isomorphism_finder(tmplt, world, candidates, *,
 
     for i, cand_idx in enumerate(cand_idxs):
         candidates_copy = candidates.copy()
-        candidates_copy[node_idx] = one_hot(cand_idx, world.n_nodes)
+        candidates_copy[node_idx] = False
+        candidates_copy[node_idx, cand_idx] = True
 
         # recurse to make assignment for the next node in the unspecified cover
         recursive_isomorphism_finder(
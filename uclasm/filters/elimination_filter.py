@@ -9,24 +9,25 @@ def centrality_ordered_node_idxs(tmplt, world, candidates):
     """
 
     cand_counts = candidates.sum(axis=1)
-    degrees = tmplt.sym_composite_adj.sum(axis=1)
-    nbr_counts = tmplt.is_nbr.sum(axis=1)
+    degrees = tmplt.sym_composite_adj.sum(axis=1).A1
+    nbr_counts = tmplt.is_nbr.sum(axis=1).A1
 
     # The less candidates the better, and the more important the node is
-    metric_cand_count = lambda node_idx: cand_counts[node_idx]
+    metric_cand_count = cand_counts
 
     # The higher the degree, the more important the node.
-    metric_degree = lambda node_idx: -degrees[node_idx]
+    metric_degree = -degrees
 
     # The higher the max-k-core of the node, the more important it is
-    metric_nbr_count = lambda node_idx: -nbr_counts[node_idx]
+    metric_nbr_count = -nbr_counts
 
     # TODO: optimize over metric orders
-    # Put the metrics in some arbitrary order
-    metrics = [metric_cand_count, metric_nbr_count, metric_degree]
-    metric_tuple = lambda idx: tuple(metric(idx) for metric in metrics)
+    # Put the metrics in some arbitrary order. np.lexsort sorts by all of the
+    # metrics in a single stable pass, using the last metric as the primary
+    # key, so the order here is the reverse of the order of importance.
+    metrics = [metric_degree, metric_nbr_count, metric_cand_count]
 
-    return sorted(range(tmplt.n_nodes), key=metric_tuple)
+    return np.lexsort(metrics).tolist()
 
 def elimination_filter(tmplt, world, candidates, *,
                        changed_cands=None,
@@ -62,7 +63,8 @@ def elimination_filter(tmplt, world, candidates, *,
             # Don't modify the original template unless you mean to
             candidates_copy = candidates.copy()
             candidates_copy[:, cand_idx] = False
-            candidates_copy[node_idx, :] = one_hot(cand_idx, world.n_nodes)
+            candidates_copy[node_idx, :] = False
+            candidates_copy[node_idx, cand_idx] = True
 
             if verbose and i % 10 == 0:
                 print("cand {} of {}".format(i, len(cand_idxs)))
@@ -1,7 +1,7 @@
 import numpy as np
 import networkx as nx
 from scipy import sparse
-from scipy import optimize
+from scipy.sparse import csgraph
 import time
 
 # TODO: This filter is very slow. Make it faster.
@@ -15,13 +15,17 @@ def get_edge_seqs(graph, channels=None, nodes=None):
     if nodes is None:
         nodes = np.ones(graph.nodes.shape, dtype=np.bool)
 
+    # Stack the out and in edges of every channel so that the edge sequence
+    # of a node can be read off with a single strided row slice.
+    adj_list = []
+    for channel in channels:
+        adj = graph.ch_to_adj[channel]
+        adj_list.extend([adj, adj.T])
+    stacked_adj = sparse.vstack(adj_list, format="csr")
+
     edge_seqs = {}
-    for node_idx in range(graph.n_nodes):
-        seq_list = []
-        for channel in channels:
-            adj = graph.ch_to_adj[channel]
-            seq_list.extend([adj[node_idx,:], adj.T[node_idx,:]])
-        edge_seqs[node_idx] = sparse.vstack(seq_list, format="csr")
+    for node_idx in np.flatnonzero(nodes):
+        edge_seqs[node_idx] = stacked_adj[node_idx::graph.n_nodes]
 
     return edge_seqs
 
@@ -45,38 +49,54 @@ def neighborhood_filter(tmplt, world, candidates, *,
     if np.sum(is_cand_any) == 0:
         return
 
-    tmplt_edge_seqs = get_edge_seqs(tmplt)
+    nbr_counts = tmplt.is_nbr.sum(axis=1).A.flatten()
+
+    # Template edge sequences are reused for every candidate of a template
+    # node, so densify them once up front rather than once per candidate.
+    tmplt_edge_seqs = {node_idx: edge_seq.A for node_idx, edge_seq
+                       in get_edge_seqs(tmplt, nodes=nbr_counts != 1).items()}
     world_edge_seqs = get_edge_seqs(world, channels=tmplt.channels,
                                     nodes=is_cand_any)
 
-    nbr_counts = tmplt.is_nbr.sum(axis=1).A.flatten()
+    # Candidates as they were before this filter started eliminating any
+    is_cand = candidates.copy()
 
-    # TODO: might want candidates to be sparse in other filters
-    sparse_is_cand = sparse.csr_matrix(candidates)
-    for tnode_idx, wnode_idx in np.transpose(sparse_is_cand.nonzero()):
-        # If the template node has only 1 neighbor, the topology filter is
-        # equivalent to the neighborhood filter, so there is no point in
-        # using the neighborhood filter since it is more expensive.
-        if nbr_counts[tnode_idx] == 1:
-            continue
+    # If the template node has only 1 neighbor, the topology filter is
+    # equivalent to the neighborhood filter, so there is no point in
+    # using the neighborhood filter since it is more expensive. Leave those
+    # template nodes out of the loop entirely.
+    cand_idx_pairs = np.argwhere(is_cand & (nbr_counts != 1)[:, None])
 
+    for tnode_idx, wnode_idx in cand_idx_pairs:
         tmplt_seq = tmplt_edge_seqs[tnode_idx]
-        world_seq = world_edge_seqs[wnode_idx]
-
-        lap_mat_rows = []
-        for tnbr_idx in range(tmplt.n_nodes):
-            lap_mat_row = sparse_is_cand[tnbr_idx]
-            # Check if all off the necessary edges are present
-            for i, edge_count in enumerate(tmplt_seq[:,tnbr_idx].A.flat):
-                if edge_count > 0:
-                    lap_mat_row = lap_mat_row.multiply(world_seq[i] >= edge_count)
-            lap_mat_rows.append(lap_mat_row)
-
-        # TODO: do we really need to run LAP with this whole matrix?
-        # we should throw out empty rows and columns before densifying.
-        lap_mat = ~sparse.vstack(lap_mat_rows).A
-        row_idxs, col_idxs = optimize.linear_sum_assignment(lap_mat)
-        if lap_mat[row_idxs, col_idxs].sum() > 0:
+        world_seq = world_edge_seqs[wnode_idx].A
+
+        # i,j entry is True if world node j is a candidate for template node i
+        # and has all of the necessary edges to the world node wnode_idx.
+        # A template edge count of zero is satisfied by any world node, so each
+        # row of the edge sequences can be checked for all pairs at once.
+        is_feasible = is_cand.copy()
+        for tmplt_row, world_row in zip(tmplt_seq, world_seq):
+            is_feasible &= tmplt_row[:, None] <= world_row[None, :]
+
+        # Each template node needs a distinct feasible world node. If some
+        # template node has none, or there are fewer world nodes feasible for
+        # anything than there are template nodes, skip the LAP altogether.
+        is_feasible_any = is_feasible.any(axis=0)
+        if not is_feasible.any(axis=1).all() or \
+                is_feasible_any.sum() < tmplt.n_nodes:
+            candidates[tnode_idx, wnode_idx] = 0
+            continue
+
+        # World nodes which are not feasible for any template node cannot be
+        # part of the matching, so throw them out to shrink the problem.
+        # Every cost in the LAP would be either 0 or 1, so rather than solving
+        # a LAP we only need to know whether a perfect matching of the
+        # template nodes exists in the bipartite feasibility graph.
+        feasible_graph = sparse.csr_matrix(is_feasible[:, is_feasible_any])
+        matched_cols = csgraph.maximum_bipartite_matching(
+            feasible_graph, perm_type="column")
+        if np.any(matched_cols == -1):
             candidates[tnode_idx, wnode_idx] = 0
 
     return tmplt, world, candidates
@@ -8,41 +8,46 @@ def compute_features(graph, channels=None):
     is_cand_any is a bool vector of nodes we care about
     """
 
-    features_list = []
-
     # default to computing features for every channel in the default order
     if channels is None:
         channels = graph.channels
 
+    # Rather than concatenating a list of feature rows at the end, each
+    # feature is written straight into its row of a preallocated matrix.
+    n_ch_features = 8
+    features = np.empty((n_ch_features * len(channels), graph.n_nodes))
+
     # for each channel, compute some featurers
-    for channel in channels:
+    for ch_idx, channel in enumerate(channels):
         adj = graph.ch_to_adj[channel]
+        is_nbr = adj > 0
+        ch_features = features[n_ch_features*ch_idx:n_ch_features*(ch_idx+1)]
 
         # in degree
-        features_list.append(adj.sum(axis=0).A)
+        ch_features[0] = adj.sum(axis=0).A1
 
         # out degree
-        features_list.append(adj.sum(axis=1).T.A)
+        ch_features[1] = adj.sum(axis=1).A1
 
         # max in edge multiplicity
-        features_list.append(adj.max(axis=0).A)
+        ch_features[2] = adj.max(axis=0).A.ravel()
 
         # max out edge multiplicity
-        features_list.append(adj.max(axis=1).todense().T.A)
+        ch_features[3] = adj.max(axis=1).A.ravel()
 
         # neighbors coming in
-        features_list.append((adj > 0).sum(axis=0).A)
+        ch_features[4] = is_nbr.sum(axis=0).A1
 
         # neighbors going out
-        features_list.append((adj > 0).sum(axis=1).T.A)
+        ch_features[5] = is_nbr.sum(axis=1).A1
 
         # self edges
-        features_list.append(np.reshape(adj.diagonal(), (1, -1)))
+        ch_features[6] = adj.diagonal()
 
         # reciprocated edges
-        features_list.append(adj.multiply(adj.T).sum(axis=0).A)
+        ch_features[7] = adj.multiply(adj.T).sum(axis=0).A1
 
-    return np.concatenate(features_list, axis=0)
+    return features
 
 class _cache():
     tmplt = None
@@ -23,30 +23,46 @@ def topology_filter(tmplt, world, candidates, *,
                    candidates that have changed since last time this ran
     """
     ch_to_world_adj_T = {channel: world_adj.T[:,:] for channel, world_adj in world.ch_to_adj.items()}
-    for src_idx, dst_idx in np.argwhere(tmplt.is_nbr):
-        if changed_cands is not None:
-            # If neither the source nor destination has changed, there is no
-            # point in filtering on this pair of nodes
-            if not (changed_cands[src_idx] or changed_cands[dst_idx]):
-                continue
 
+    # The template is small, so stack the dense adjacency matrices of all of
+    # its channels into a single array. The edge counts between a pair of
+    # template nodes in every channel can then be read off in one lookup
+    # rather than indexing each sparse matrix separately.
+    tmplt_channels = list(tmplt.ch_to_adj)
+    tmplt_adj_stack = np.stack([tmplt.ch_to_adj[channel].toarray()
+                                for channel in tmplt_channels])
+
+    nbr_idx_pairs = np.argwhere(tmplt.is_nbr)
+    if changed_cands is not None:
+        # If neither the source nor destination has changed, there is no
+        # point in filtering on this pair of nodes. Drop such pairs up front
+        # rather than checking each one inside the loop.
+        nbr_idx_pairs = nbr_idx_pairs[changed_cands[nbr_idx_pairs].any(axis=1)]
+
+    for src_idx, dst_idx in nbr_idx_pairs:
         # get indicators of candidate nodes in the world adjacency matrices
         src_is_cand = candidates[src_idx]
         dst_is_cand = candidates[dst_idx]
 
         # enough_edges = np.zeros((len(src_is_cand), len(dst_is_cand)), dtype=np.bool)
         enough_edges = None
+
+        # edge counts in each channel in both directions between the pair
+        tmplt_adj_vals1 = tmplt_adj_stack[:, src_idx, dst_idx]
+        tmplt_adj_vals2 = tmplt_adj_stack[:, dst_idx, src_idx]
+
+        # channels in which the template has edges between the pair. If there
+        # are no edges in a channel of the template, we can skip it.
+        has_tmplt_edges = (tmplt_adj_vals1 != 0) | (tmplt_adj_vals2 != 0)
+
         # figure out which candidates have enough edges between them in world
-        for channel in tmplt.ch_to_adj:
-            tmplt_adj = tmplt.ch_to_adj[channel]
+        for ch_idx in np.flatnonzero(has_tmplt_edges):
+            channel = tmplt_channels[ch_idx]
             world_adj = world.ch_to_adj[channel]
 
-            tmplt_adj_val1 = tmplt_adj[src_idx, dst_idx]
-            tmplt_adj_val2 = tmplt_adj[dst_idx, src_idx]
+            tmplt_adj_val1 = tmplt_adj_vals1[ch_idx]
+            tmplt_adj_val2 = tmplt_adj_vals2[ch_idx]
 
-            # if there are no edges in this channel of the template, skip it
-            if tmplt_adj_val1 == 0 and tmplt_adj_val2 == 0:
-                continue
             world_adj_T = ch_to_world_adj_T[channel]
             if tmplt_adj_val1 > 0:
                 # sub adjacency matrix corresponding to edges from the source
@@ -92,7 +92,8 @@ def validate_isomorphisms(tmplt, world, candidates, unspec_cover, marked,
     for cand_idx in unspec_cands:
         # Make a copy to avoid messing up candidate sets during recursion
         candidates_copy = candidates.copy()
-        candidates_copy[unspec_idx, :] = uclasm.one_hot(cand_idx, world.n_nodes)
+        candidates_copy[unspec_idx, :] = False
+        candidates_copy[unspec_idx, cand_idx] = True
 
         # rerun filters after picking an assignment for the next unspec node
         _, new_world, new_candidates = uclasm.run_filters(
@@ -149,10 +150,10 @@ def validation_filter(tmplt, world, *, candidates=None, in_signal_only=False,
         # TODO: only recompute unspec_cover when necessary or not at all
         # Get node cover for unspecified nodes
         cand_counts = candidates.sum(axis=1)
-        unspec_subgraph = tmplt.subgraph(cand_counts > 1)
-        unspec_cover = uclasm.get_node_cover(unspec_subgraph)
-        unspec_cover = np.array([tmplt.node_idxs[unspec_subgraph.nodes[idx]]
-                                 for idx in unspec_cover], dtype=np.int)
+        unspec_idxs = np.flatnonzero(cand_counts > 1)
+        unspec_subgraph = tmplt.subgraph(unspec_idxs)
+        # Map the cover from subgraph indices back to template indices
+        unspec_cover = unspec_idxs[uclasm.get_node_cover(unspec_subgraph)]
 
         # Find a marked template node idx and a cand to pair together
 
@@ -170,8 +171,8 @@ def validation_filter(tmplt, world, *, candidates=None, in_signal_only=False,
             # Set a candidate for the marked template node as the marked cand
             marked_cand_idx = np.argwhere(marked[marked_tmplt_idx])[0,0]
 
-        candidates_copy[marked_tmplt_idx, :] = uclasm.one_hot(marked_cand_idx,
-                                                              world.n_nodes)
+        candidates_copy[marked_tmplt_idx, :] = False
+        candidates_copy[marked_tmplt_idx, marked_cand_idx] = True
 
         # TODO: pass arguments as keywords to avoid bugs when changes are made
         if not validate_isomorphisms(tmplt, world, candidates_copy,
@@ -6,8 +6,10 @@ from scipy.sparse import csr_matrix
 # TODO: make channel column optional
 
 def edgelist_to_adjs(edgelist, nodelist=None):
-    edgecounts = edgelist.groupby(by=edgelist.columns.tolist(),
-                                  as_index=False).size().reset_index(name="count")
+    # Grouping with the default as_index=True gives a Series of group sizes,
+    # so reset_index moves the group keys into columns in a single step.
+    edgecounts = edgelist.groupby(by=edgelist.columns.tolist()).size() \
+                         .reset_index(name="count")
 
     if "channel" in edgelist.columns:
         channels = edgecounts.channel.unique()
@@ -18,22 +20,24 @@ def edgelist_to_adjs(edgelist, nodelist=None):
 
     nodes = nodelist.node
 
-    node_to_idx = {node: idx for idx, node in enumerate(nodes)}
-    edgecounts[["src", "dst"]] = edgecounts[["src", "dst"]].applymap(node_to_idx.get)
+    # Hashed lookup of the index of every src and dst node at once
+    node_idxs = pd.Index(nodes)
+    edgecounts["src"] = node_idxs.get_indexer(edgecounts["src"])
+    edgecounts["dst"] = node_idxs.get_indexer(edgecounts["dst"])
 
     if "channel" in edgelist.columns:
         adjs = []
         for channel in channels:
             ch_ec = edgecounts[edgecounts.channel==channel]
             adjs.append(csr_matrix((ch_ec["count"], (ch_ec["src"], ch_ec["dst"])),
-                        shape=(len(node_to_idx), len(node_to_idx))))
+                        shape=(len(node_idxs), len(node_idxs))))
     else:
         # [None] is used since there are no channels
         channels = [None]
         # Short alias for edgecounts df for ease of typing
         ec = edgecounts
         adjs = [csr_matrix((ec["count"], (ec["src"], ec["dst"])),
-                shape=(len(node_to_idx), len(node_to_idx)))]
+                shape=(len(node_idxs), len(node_idxs)))]
 
     return nodelist, channels, adjs
 
@@ -60,8 +64,9 @@ def load_combo(filepath, *,
                            engine='python',
                            **kwargs)
 
-    # Get rid of the "vs" column
-    nodelist = nodelist[nodelist.vs == node_str][names[1:]]
+    # Get rid of the "vs" column. Selecting rows and columns in one .loc call
+    # avoids materializing an intermediate copy of the filtered rows.
+    nodelist = nodelist.loc[nodelist.vs == node_str, names[1:]]
 
     if channel_col is None:
         usecols = [node_vs_edge_col, src_col, dst_col]
@@ -75,7 +80,7 @@ def load_combo(filepath, *,
                            names=names,
                            engine='python',
                            **kwargs)
-    edgelist = edgelist[edgelist.vs != node_str][names[1:]]
+    edgelist = edgelist.loc[edgelist.vs != node_str, names[1:]]
 
     return edgelist_to_adjs(edgelist, nodelist)
 
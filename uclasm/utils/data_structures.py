@@ -5,13 +5,22 @@ Filtering algorithms expect data to come in the form of Graph objects
 from .misc import index_map
 import scipy.sparse as sparse
 import numpy as np
-import networkx as nx
 
 class Graph:
     def __init__(self, nodes, channels, adjs, labels=None):
         self.nodes = np.array(nodes)
         self.n_nodes = len(nodes)
         self.node_idxs = index_map(self.nodes)
+
+        # Put the adjacency matrices in canonical form once up front so that
+        # the sparse operations done on them later never have to. Note that
+        # this modifies the matrices passed in by the caller in place. Zeros
+        # are eliminated after summing duplicates, since duplicate entries
+        # may add up to zero.
+        for adj in adjs:
+            adj.sum_duplicates()
+            adj.eliminate_zeros()
+
         self.ch_to_adj = {ch: adj for ch, adj in zip(channels, adjs)}
         self.channels = channels
         self.adjs = adjs
@@ -42,7 +51,15 @@ class Graph:
     @property
     def is_nbr(self):
         if self._is_nbr is None:
-            self._is_nbr = self.sym_composite_adj > 0
+            # Gather the positions of the edges in every channel in both
+            # directions. Duplicate positions are merged when building the csr
+            # matrix, so we never have to sum the adjacency matrices.
+            src_idxs, dst_idxs = zip(*[adj.nonzero() for adj in self.adjs])
+            rows = np.concatenate(src_idxs + dst_idxs)
+            cols = np.concatenate(dst_idxs + src_idxs)
+            self._is_nbr = sparse.csr_matrix(
+                (np.ones(len(rows), dtype=np.bool_), (rows, cols)),
+                shape=(self.n_nodes, self.n_nodes))
 
         return self._is_nbr
 
@@ -53,7 +70,11 @@ class Graph:
         a pair of neighbors in the graph. Each pair is only returned once, so
         for example only one of (0,3) and (3,0) could appear as rows.
         """
-        return np.argwhere(sparse.tril(self.is_nbr))
+        # Keep the entries of is_nbr on or below the diagonal. Filtering the
+        # coordinates directly avoids building a triangular sparse matrix.
+        is_nbr = self.is_nbr.tocoo()
+        in_tril = is_nbr.row >= is_nbr.col
+        return np.stack([is_nbr.row[in_tril], is_nbr.col[in_tril]], axis=1)
 
     def subgraph(self, node_idxs):
         """
@@ -70,11 +91,21 @@ class Graph:
 
     def copy(self):
         """
-        The only thing this bothers to copy is the adjacency matrices
+        The only thing this bothers to copy is the adjacency matrices.
+        Quantities already computed from the adjacency matrices are shared
+        with the copy rather than recomputed, so modifying the adjacency
+        matrices of the copy in place will leave them stale.
         """
-        return Graph(self.nodes, self.channels,
-                     [adj.copy() for adj in self.adjs],
-                     labels=self.labels)
+        graph = Graph(self.nodes, self.channels,
+                      [adj.copy() for adj in self.adjs],
+                      labels=self.labels)
+
+        # The copied adjacency matrices are identical to ours
+        graph._composite_adj = self._composite_adj
+        graph._sym_composite_adj = self._sym_composite_adj
+        graph._is_nbr = self._is_nbr
+
+        return graph
 
     def write_channel_solnon(self, filename, channel, dir=""):
         """
@@ -210,7 +241,26 @@ def from_networkx_graph(nx_graph):
     """
 
     # TODO: Add the ability to port over node and edge labels
-    adj = nx.to_scipy_sparse_matrix(nx_graph)
-    nodes = list(range(nx_graph.number_of_nodes()))
+    node_to_idx = index_map(nx_graph.nodes())
+    n_nodes = len(node_to_idx)
+
+    # Build the adjacency matrix straight from the edge list. Parallel edges
+    # in multigraphs are summed when the csr matrix is constructed.
+    edges = list(nx_graph.edges(data="weight", default=1))
+    srcs = np.fromiter((node_to_idx[src] for src, _, _ in edges),
+                       dtype=np.int64, count=len(edges))
+    dsts = np.fromiter((node_to_idx[dst] for _, dst, _ in edges),
+                       dtype=np.int64, count=len(edges))
+    weights = np.array([weight for _, _, weight in edges])
+
+    # Undirected edges go in both directions, but self loops only once
+    if not nx_graph.is_directed():
+        is_loop = srcs == dsts
+        srcs, dsts = (np.concatenate([srcs, dsts[~is_loop]]),
+                      np.concatenate([dsts, srcs[~is_loop]]))
+        weights = np.concatenate([weights, weights[~is_loop]])
+
+    adj = sparse.csr_matrix((weights, (srcs, dsts)), shape=(n_nodes, n_nodes))
+    nodes = list(range(n_nodes))
     channels = [0]
     return Graph(nodes, channels, [adj])
@@ -1,4 +1,3 @@
-from .misc import one_hot
 import numpy as np
 
 def get_node_cover(graph):
@@ -9,19 +8,36 @@ def get_node_cover(graph):
 
     cover = []
 
-    # Initially there are no nodes in the cover. We add them one by one below.
+    is_nbr = graph.is_nbr.tocsr()
+
+    # Number of uncovered neighbors of each node. Rather than slicing out the
+    # uncovered subgraph on every iteration, we update these counts as nodes
+    # are added to the cover. Covered nodes get a count of -1 so that they are
+    # never chosen again.
+    nbr_counts = np.asarray(is_nbr.sum(axis=0)).ravel().astype(np.int64)
     uncovered = np.ones(graph.n_nodes, dtype=np.bool_)
 
+    # Number of entries of is_nbr between pairs of uncovered nodes. The
+    # graph is disconnected once this hits zero.
+    n_uncovered_entries = is_nbr.count_nonzero()
+    has_self_edge = is_nbr.diagonal()
+
     # Until the cover disconnects the graph, add a node to the cover
-    while graph.is_nbr[uncovered, :][:, uncovered].count_nonzero():
+    while n_uncovered_entries > 0:
 
         # Add the uncovered node with the most neighbors
-        nbr_counts = np.sum(graph.is_nbr[uncovered, :][:, uncovered], axis=0)
-
         imax = np.argmax(nbr_counts)
-        node = graph.nodes[uncovered][imax]
+        cover.append(imax)
+        uncovered[imax] = False
+
+        # Its row and column leave the uncovered part of is_nbr. is_nbr is
+        # symmetric, so both have nbr_counts[imax] entries, and a self edge
+        # appears in both.
+        n_uncovered_entries -= 2 * nbr_counts[imax] - has_self_edge[imax]
+        nbr_counts[imax] = -1
 
-        cover.append(graph.node_idxs[node])
-        uncovered[uncovered] = ~one_hot(imax, np.sum(uncovered))
+        # The uncovered neighbors of the new cover node lose a neighbor
+        nbr_idxs = is_nbr.indices[is_nbr.indptr[imax]:is_nbr.indptr[imax+1]]
+        nbr_counts[nbr_idxs[uncovered[nbr_idxs]]] -= 1
 
-    return np.array(cover)
+    return np.array(cover, dtype=np.int64)